@@ -2,20 +2,30 @@ import pandas as pd
 import glob
 
 if __name__ == "__main__":
-    files = glob.glob("./outputs/*/*.csv")
+    files = glob.glob("./outputs/*/*.parquet")
     
-    result = None
+    dfs = []
+    seen_columns = set()
     for file in files:
-        df = pd.read_csv(file)
+        df = pd.read_parquet(file, dtype_backend='pyarrow')
         
-        # Set hhid as index
-        df = df.set_index('hhid')
-        
-        if result is None:
-            result = df
+        # Monthly outputs (pm25) have one row per hhid and date; spread them
+        # into one column per month so every frame is indexed by hhid alone
+        if 'date' in df.columns:
+            value_columns = df.columns.difference(['hhid', 'date', 'latitude', 'longitude', 'wilcah'])
+            df = df.assign(
+                month=df['date'].str.slice(0, 7).str.replace('-', '_')
+            ).pivot(index='hhid', columns='month', values=list(value_columns))
+            df.columns = [f"{value}_{month}" for value, month in df.columns]
         else:
-            result = result.join(df, how='outer', rsuffix='_new')
-            drop_columns = [col for col in result.columns if col.endswith('_new')]
-            result = result.drop(columns=drop_columns)
+            # Set hhid as index
+            df = df.set_index('hhid')
+        
+        # Keep only columns not already provided by an earlier file
+        df = df.loc[:, ~df.columns.isin(seen_columns)]
+        seen_columns.update(df.columns)
+        dfs.append(df)
+    
+    result = dfs[0].join(dfs[1:], how='outer')
     
-    result.to_csv("./outputs/contamination.csv", index=True)
\ No newline at end of file
+    result.to_csv("./outputs/contamination.csv", index=True)
@@ -0,0 +1,31 @@
+import pandas as pd
+import geopandas
+
+
+def nearest_distance(
+    points: geopandas.GeoDataFrame, targets: geopandas.GeoDataFrame
+) -> pd.Series:
+    """
+    Computes the distance from each point to its nearest target geometry
+    using a spatial index instead of a brute-force scan.
+
+    Args:
+        points (geopandas.GeoDataFrame): The geometries to measure from.
+        targets (geopandas.GeoDataFrame): The geometries to measure to, in
+                                          the same CRS as `points`.
+
+    Returns:
+        pandas.Series: The nearest distance for each point, in CRS units and
+                       aligned to the index of `points`. All values are NaN
+                       if `targets` is empty.
+    """
+    if len(targets) == 0:
+        return pd.Series(float("nan"), index=points.index)
+
+    nearest = geopandas.sjoin_nearest(
+        points[["geometry"]], targets[["geometry"]], distance_col="distance"
+    )
+    # Equidistant targets produce one row per tie; keep a single match
+    nearest = nearest[~nearest.index.duplicated(keep="first")]
+
+    return nearest["distance"].reindex(points.index)
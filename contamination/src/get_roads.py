@@ -1,5 +1,8 @@
-from loading import load_hhs_data
+from loading import load_projected_hhs_data
 import geopandas as gpd
+import numpy as np
+import shapely
+from pyproj import Transformer
 HHS_DATA = '../data/hhs/l2idn_gps_b2.csv'
 ROADS_DATA = '../data/roads/heigit_idn_roadsurface_lines.geojson'
 ROADS_OUTPUT = '../data/roads/roads.geojson'
@@ -7,13 +10,20 @@ ROADS_OUTPUT = '../data/roads/roads.geojson'
 if __name__ == "__main__":
 
     print('Loading HHS data...')
-    hhs_gdf = load_hhs_data(HHS_DATA)
+    hhs_gdf = load_projected_hhs_data(HHS_DATA, epsg=3857)
 
-    hhs_gdf['geometry'] = hhs_gdf.to_crs(epsg=3857).buffer(1000).to_crs(epsg=4326)
-    filt = hhs_gdf.geometry.union_all()
+    # Dissolve 1km boxes around each point in EPSG:3857 (a cheap superset of
+    # the 1km buffers), then reproject only the merged mask back to EPSG:4326
+    # with a single array transform
+    x, y = hhs_gdf.geometry.x.values, hhs_gdf.geometry.y.values
+    filt = shapely.union_all(shapely.box(x - 1000, y - 1000, x + 1000, y + 1000))
+    to_4326 = Transformer.from_crs(3857, 4326, always_xy=True)
+    filt = shapely.transform(
+        filt, lambda xy: np.column_stack(to_4326.transform(xy[:, 0], xy[:, 1]))
+    )
     print('Loading and filtering roads data...')
-    roads = gpd.read_file(ROADS_DATA, mask=filt)
+    roads = gpd.read_file(ROADS_DATA, mask=filt, engine='pyogrio')
     
     print('Saving roads...')
-    roads.to_file(ROADS_OUTPUT, driver='GeoJSON')
+    roads.to_file(ROADS_OUTPUT, driver='GeoJSON', engine='pyogrio')
     print('Done.')
@@ -1,18 +1,18 @@
 import pandas as pd
 import geopandas as gpd
-from loading import load_geojson, load_hhs_data
+from loading import load_geojson, load_projected_hhs_data
+from distances import nearest_distance
 
 HHS_DATA = '../data/hhs/l2idn_gps_b2.csv'
 HEALTHCARE_DATA = '../data/health/healthcare.geojson'
-OUTPUT_FILE = '../outputs/health/health_distances.csv'
+OUTPUT_FILE = '../outputs/health/health_distances.parquet'
 
 if __name__ == "__main__":
-    hhs_gdf = load_hhs_data(HHS_DATA)
+    hhs_gdf = load_projected_hhs_data(HHS_DATA, epsg=3857)
     healthcare = load_geojson(HEALTHCARE_DATA)
     healthcare = healthcare[healthcare.amenity.isin(['hospital', 'clinic'])]
     
-    # Reproject both GeoDataFrames to EPSG:3857 for accurate distance calculations
-    hhs_gdf = hhs_gdf.to_crs('EPSG:3857')
+    # Reproject healthcare to the HHS points' EPSG:3857 for accurate distance calculations
     healthcare = healthcare.to_crs('EPSG:3857')
     
     # Separate hospitals and clinics
@@ -20,15 +20,11 @@ if __name__ == "__main__":
     clinics = healthcare[healthcare.amenity == 'clinic']
     
     # Calculate distance to nearest hospital (in km)
-    hhs_gdf['distance_to_hospital_km'] = hhs_gdf.geometry.apply(
-        lambda point: hospitals.geometry.distance(point).min() / 1000 if len(hospitals) > 0 else None
-    )
+    hhs_gdf['distance_to_hospital_km'] = (nearest_distance(hhs_gdf, hospitals) / 1000).astype('float32')
     
     # Calculate distance to nearest clinic (in km)
-    hhs_gdf['distance_to_clinic_km'] = hhs_gdf.geometry.apply(
-        lambda point: clinics.geometry.distance(point).min() / 1000 if len(clinics) > 0 else None
-    )
+    hhs_gdf['distance_to_clinic_km'] = (nearest_distance(hhs_gdf, clinics) / 1000).astype('float32')
     
-    hhs_gdf = hhs_gdf.to_crs('EPSG:4326')
-    # Export to CSV
-    hhs_gdf.to_csv(OUTPUT_FILE, index=False)
+    # Export to Parquet; latitude/longitude already locate each point
+    output_df = hhs_gdf.drop(columns=['geometry'])
+    output_df.to_parquet(OUTPUT_FILE, index=False, compression='zstd')
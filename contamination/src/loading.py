@@ -1,6 +1,5 @@
 import pandas as pd
 import geopandas
-from shapely.geometry import Point
 import os
 
 def load_geojson(file_path: str) -> geopandas.GeoDataFrame:
@@ -10,7 +9,7 @@ def load_geojson(file_path: str) -> geopandas.GeoDataFrame:
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"The file {file_path} does not exist.")
 
-    return geopandas.read_file(file_path)
+    return geopandas.read_file(file_path, engine="pyogrio")
     
 
 def load_hhs_data(file_path: str) -> geopandas.GeoDataFrame:
@@ -28,7 +27,7 @@ def load_hhs_data(file_path: str) -> geopandas.GeoDataFrame:
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"The file {file_path} does not exist.")
 
-    df = pd.read_csv(file_path)
+    df = pd.read_csv(file_path, engine="pyarrow")
 
     # Ensure latitude and longitude columns exist
     if "latitude" not in df.columns or "longitude" not in df.columns:
@@ -36,11 +35,42 @@ def load_hhs_data(file_path: str) -> geopandas.GeoDataFrame:
             "CSV file must contain 'latitude' and 'longitude' columns."
         )
 
-    # Create Point geometries
-    geometry = [Point(xy) for xy in zip(df["longitude"], df["latitude"])]
+    # Create GeoDataFrame with Point geometries built in a single vectorized call
+    gdf = geopandas.GeoDataFrame(
+        df,
+        geometry=geopandas.points_from_xy(
+            df["longitude"], df["latitude"], crs="EPSG:4326"
+        ),
+    )
+
+    return gdf
+
+
+def load_projected_hhs_data(file_path: str, epsg: int = 3857) -> geopandas.GeoDataFrame:
+    """
+    Loads HHS points reprojected to the given EPSG code, caching the result
+    as GeoParquet next to the CSV so the transform only runs once across
+    scripts. The cache is rebuilt whenever the CSV is newer than it.
+
+    Args:
+        file_path (str): The path to the CSV file.
+        epsg (int): The EPSG code to reproject to (default: 3857).
+
+    Returns:
+        geopandas.GeoDataFrame: The HHS points in the requested CRS.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"The file {file_path} does not exist.")
+
+    cache_path = f"{os.path.splitext(file_path)[0]}_{epsg}.parquet"
+    if (
+        os.path.exists(cache_path)
+        and os.path.getmtime(cache_path) >= os.path.getmtime(file_path)
+    ):
+        return geopandas.read_parquet(cache_path)
 
-    # Create GeoDataFrame
-    gdf = geopandas.GeoDataFrame(df, geometry=geometry, crs="EPSG:4326")
+    gdf = load_hhs_data(file_path).to_crs(epsg=epsg)
+    gdf.to_parquet(cache_path)
 
     return gdf
 
@@ -1,28 +1,55 @@
-import rioxarray as rxr 
-import geopandas as gpd
+import rioxarray as rxr
+import xarray as xr
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from loading import load_hhs_data
 import os
-from tqdm import tqdm
+import glob
 import pandas as pd
 
 PM25_DATA = "../data/pm25/stlouis/2023/"
 HHS_DATA = "../data/hhs/l2idn_gps_b2.csv"
-OUTPUT_FILE = "../outputs/pm25/hhs_pm25.csv"
+OUTPUT_FILE = "../outputs/pm25/hhs_pm25.parquet"
+
+
+def file_date(file):
+    # Filenames carry the month as "<prefix>-YYYYMM.nc"
+    return pd.to_datetime(
+        os.path.basename(file).split("-")[1].split(".")[0], format="%Y%m"
+    )
+
+
+def sample_file(file, x, y):
+    # One nearest selection samples every point; reading a single month's
+    # grid this way needs no dask. The coordinates come in as plain NumPy
+    # arrays so they are cheap to send to worker processes
+    xs = xr.DataArray(x, dims="points")
+    ys = xr.DataArray(y, dims="points")
+    with rxr.open_rasterio(file) as da:
+        return da.sel(x=xs, y=ys, method="nearest").squeeze("band", drop=True).values
+
 
 if __name__ == "__main__":
     hhs_gdf = load_hhs_data(HHS_DATA)
 
-    files = os.listdir(PM25_DATA)
-    output = []
-    for file in tqdm(files):
-        date = file.split("-")[1].split(".")[0]
-        if file.endswith(".nc"):
-            ds = rxr.open_rasterio(PM25_DATA + file)
-            for _, row in hhs_gdf.iterrows():
-                pm25 = ds.sel(x=row.geometry.x, y=row.geometry.y, method="nearest").values.squeeze()
-                row["pm25"] = pm25
-                row['date'] = pd.to_datetime(date, format="%Y%m").strftime("%Y-%m-%d")
-                output.append(row)
+    files = sorted(glob.glob(PM25_DATA + "*.nc"))
+
+    # Monthly files are independent, so each is read and sampled in its own
+    # worker process; map keeps the results in file order
+    sample = partial(
+        sample_file, x=hhs_gdf.geometry.x.values, y=hhs_gdf.geometry.y.values
+    )
+    with ProcessPoolExecutor() as executor:
+        samples = list(executor.map(sample, files))
+
+    output = [
+        hhs_gdf.assign(
+            pm25=values.astype('float32'),
+            date=file_date(file).strftime("%Y-%m-%d"),
+        )
+        for file, values in zip(files, samples)
+    ]
     
-    output_gdf = gpd.GeoDataFrame(output, geometry='geometry')
-    output_gdf.to_csv(OUTPUT_FILE, index=False)
\ No newline at end of file
+    # Export to Parquet; latitude/longitude already locate each point
+    output_df = pd.concat(output, ignore_index=True).drop(columns=['geometry'])
+    output_df.to_parquet(OUTPUT_FILE, index=False, compression='zstd')
@@ -1,7 +1,56 @@
 import pandas as pd
 import os
+import re
 import argparse
 
+# Hourly exports hold one row per region and day, with one "h<HH>_<stat>"
+# column per hour and statistic (e.g. "h05_temperature_2m_mean")
+HOUR_COLUMN = re.compile(r"^h(\d{2})_(.+)$")
+
+# Season codes by month, matching the seasonal exports
+SEASONS = {
+    12: "wtr", 1: "wtr", 2: "wtr",
+    3: "spr", 4: "spr", 5: "spr",
+    6: "smr", 7: "smr", 8: "smr",
+    9: "aut", 10: "aut", 11: "aut",
+}
+
+
+def unpivot_hours(df: pd.DataFrame) -> pd.DataFrame:
+    """Reshape a day-wide hourly export into one row per region and hour."""
+    hour_columns = {}
+    for col in df.columns:
+        match = HOUR_COLUMN.match(col)
+        if match:
+            hour_columns.setdefault(int(match.group(1)), {})[col] = match.group(2)
+
+    id_columns = [
+        col for col in df.columns if not any(col in c for c in hour_columns.values())
+    ]
+
+    frames = []
+    for hour, renames in sorted(hour_columns.items()):
+        frame = df[id_columns + list(renames)].rename(columns=renames)
+        frame.insert(len(id_columns), "hour", hour)
+        frame["system:time_start"] = frame["system:time_start"] + hour * 3_600_000
+        frames.append(frame)
+
+    return pd.concat(frames, ignore_index=True).sort_values(
+        "system:time_start", kind="stable"
+    )
+
+
+def add_time_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Derive the year, month, day and season columns from system:time_start."""
+    times = pd.to_datetime(df["system:time_start"], unit="ms", utc=True).dt
+    position = df.columns.get_loc("hour")
+    df.insert(position, "year", times.year)
+    df.insert(position + 1, "month", times.month)
+    df.insert(position + 2, "day", times.day)
+    df.insert(position + 4, "season", times.month.map(SEASONS))
+    return df
+
+
 # Set up argument parser
 parser = argparse.ArgumentParser(description="Concatenate weather data CSV files.")
 parser.add_argument("--c", required=True, help="ISO3 country code (e.g., KGZ)")
@@ -32,14 +81,23 @@ files_to_concat.sort()
 # Concatenate and save
 output_filename = f"{args.c}_weather_hourly_{args.start}_{args.end}.csv"
 
-# Read and concatenate files
-df_list = [pd.read_csv(file) for file in files_to_concat]
-concatenated_df = pd.concat(df_list, ignore_index=True)
-
-# Drop the ".geo" column if it exists
-if ".geo" in concatenated_df.columns:
-    concatenated_df = concatenated_df.drop(".geo", axis=1)
+# Append files one at a time so only a single file is held in memory
+columns = None
+for file in files_to_concat:
+    # Skip the ".geo" column at read time so it is never parsed
+    header = pd.read_csv(file, nrows=0).columns
+    usecols = [col for col in header if col != ".geo"]
+    df = add_time_columns(
+        unpivot_hours(pd.read_csv(file, engine="pyarrow", usecols=usecols))
+    )
 
-concatenated_df.reset_index(drop=True).to_csv(output_filename, index=None)
+    # Keep every file in the column order of the first one
+    if columns is None:
+        columns = df.columns
+        df.to_csv(output_filename, index=None)
+    else:
+        df.reindex(columns=columns).to_csv(
+            output_filename, mode="a", header=False, index=None
+        )
 
 print(f"Successfully concatenated {len(files_to_concat)} files into {output_filename}")
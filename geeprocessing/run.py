@@ -4,18 +4,22 @@ import geopandas as gpd
 import geemap
 from src import main
 from src import pointfuncs
-from shapely.geometry import Point
 
 
+# The batch driver submits many graphs in parallel, which the high-volume
+# endpoint is meant for
+EE_HIGH_VOLUME_URL = "https://earthengine-highvolume.googleapis.com"
+
 try:
-    ee.Initialize(project="ee-jeronimol")
+    ee.Initialize(project="ee-jeronimol", opt_url=EE_HIGH_VOLUME_URL)
 except Exception as e:
     ee.Authenticate()
-    ee.Initialize()
+    ee.Initialize(opt_url=EE_HIGH_VOLUME_URL)
 
 
 # GEE Export Configuration
 EXPORT_FOLDER = "GEE_WEATHER_EXPORTS"
+EXPORT_BUCKET = None  # Cloud Storage bucket name; None exports to Google Drive
 EXPORT_SCALE = 9000  # 9km resolution, similar to ERA5-Land
 BUFFER_ROI = 50_000  # 50km buffer
 
@@ -105,15 +109,12 @@ if NAME == "UZB":
 if NAME == "IDN_B2":
     points = points[~points["hhid"].isin(DROP_IDS_IDN_B2)]
 
-points["geometry"] = points.apply(
-    lambda row: Point(row[LON_COL], row[LAT_COL]), axis=1
+points = gpd.GeoDataFrame(
+    points, geometry=gpd.points_from_xy(points[LON_COL], points[LAT_COL]), crs=4326
 )
-points = gpd.GeoDataFrame(points, crs=4326).to_crs(3857)
 
-centroids = (
-    pointfuncs.group_points(points, [ID_PROPERTY])
-    .drop([LAT_COL, LON_COL], axis=1)
-    .to_crs(4326)
+centroids = pointfuncs.group_points(points, [ID_PROPERTY]).drop(
+    [LAT_COL, LON_COL], axis=1
 )
 
 roi = centroids.copy()
@@ -137,5 +138,6 @@ main.process_single_region_batch(
     apply_gap_filling=True,
     scale=9000,
     folder_name=EXPORT_FOLDER,
+    bucket=EXPORT_BUCKET,
     groups_of_n_months=1,
 )
@@ -1,10 +1,11 @@
 import h3
+import numpy as np
+import shapely
 import geopandas as gpd
-from shapely.geometry import shape
 
 def h3_to_gdf(h3_input, crs="EPSG:4326"):
     """
-    Converts one or multiple H3 hex IDs into a GeoDataFrame using h3.cells_to_geo.
+    Converts one or multiple H3 hex IDs into a GeoDataFrame using h3.cell_to_boundary.
 
     Parameters
     ----------
@@ -21,14 +22,16 @@ def h3_to_gdf(h3_input, crs="EPSG:4326"):
         - 'geometry': shapely Polygon of the hex cell
     """
     # Ensure input is a list
-    h3_list = [h3_input] if isinstance(h3_input, str) else h3_input
+    h3_list = [h3_input] if isinstance(h3_input, str) else list(h3_input)
 
-    records = []
-    # Loop through each H3 cell
-    for hex_id in h3_list:
-        geojson = h3.cells_to_geo([hex_id])
-        # Convert GeoJSON polygon to shapely geometry
-        polygon = shape(geojson)
-        records.append({"hex_id": hex_id, "geometry": polygon})
+    # Cell boundaries come as (lat, lng) pairs; pentagons have 5 vertices, hexagons 6
+    boundaries = [h3.cell_to_boundary(hex_id) for hex_id in h3_list]
+    coords = np.array(
+        [vertex for boundary in boundaries for vertex in boundary], dtype=float
+    ).reshape(-1, 2)[:, ::-1]
+    ring_ids = np.repeat(np.arange(len(boundaries)), [len(b) for b in boundaries])
 
-    return gpd.GeoDataFrame(records, crs=crs)
+    # Build all polygons in a single vectorized shapely call
+    polygons = shapely.polygons(shapely.linearrings(coords, indices=ring_ids))
+
+    return gpd.GeoDataFrame({"hex_id": h3_list}, geometry=polygons, crs=crs)
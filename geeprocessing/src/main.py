@@ -2,34 +2,30 @@
 
 import ee
 import math
-
-
-def shift_collection(ic, offset_hours):
-    """
-    Create a shifted collection by advancing/retreating the timestamp of each image.
-    Used for temporal joins in gap-filling.
-    """
-    return ic.map(
-        lambda img: img.set(
-            "shifted_time", img.date().advance(offset_hours, "hour")
-        )
-    )
-
-
-def temporal_join(
-    primary, secondary, match_key="shifted_time", save_key="match"
-):
-    """
-    Join primary collection with secondary based on matching timestamps.
-    Used to attach temporal neighbors for gap-filling.
-    """
-    return ee.Join.saveFirst(
-        matchKey=save_key, ordering="system:time_start", outer=True
-    ).apply(
-        primary,
-        secondary,
-        ee.Filter.equals(leftField="system:time_start", rightField=match_key),
-    )
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# ERA5-Land bands exported by export_hourly_weather_data
+HOURLY_CORE_VARIABLES = [
+    "temperature_2m",
+    "snow_cover",
+    "snow_density",
+    "snow_depth",
+    "snow_depth_water_equivalent",
+    "snowfall_hourly",
+    "snowmelt_hourly",
+    "total_precipitation_hourly",
+    "u_component_of_wind_10m",
+    "v_component_of_wind_10m",
+]
+
+# Export tasks started (or about to be started) by this process that may
+# still be queued or running, oldest first. Shared by the submitting threads
+# behind _task_lock
+_started_tasks = deque()
+_task_lock = threading.Lock()
 
 
 def apply_temporal_gap_filling(collection, region, variables=None):
@@ -77,107 +73,81 @@ def apply_temporal_gap_filling(collection, region, variables=None):
             "v_component_of_wind_10m",
         ]
 
-    # Convert collection to list for easier temporal neighbor access
-    collection_list = collection.sort("system:time_start").toList(
-        collection.size()
+    collection = collection.sort("system:time_start")
+
+    # Spatial mean fallback, computed once from the collection's temporal
+    # mean rather than per image, and broadcast as a constant image
+    spatial_means = ee.Dictionary(
+        collection.select(variables)
+        .mean()
+        .reduceRegion(
+            reducer=ee.Reducer.mean(),
+            geometry=region,
+            scale=10000,
+            bestEffort=True,
+            maxPixels=1e9,
+        )
+    )
+    fallback_image = ee.Image.constant(spatial_means.values(variables)).rename(
+        variables
     )
-    collection_size = collection.size()
 
-    def fill_temporal_gaps(index):
+    # Attach the images up to 3 hours before ("prev", oldest first) and after
+    # ("next", latest first) each image through two window joins. Both
+    # windows include the image itself, so every image gets a non-empty list
+    # (ending with itself) and images at the collection edges simply get
+    # shorter ones, with no bounds checks or placeholder images needed
+    window = ee.Filter.maxDifference(
+        difference=3 * 60 * 60 * 1000,
+        leftField="system:time_start",
+        rightField="system:time_start",
+    )
+    before = ee.Filter.And(
+        window,
+        ee.Filter.greaterThanOrEquals(
+            leftField="system:time_start", rightField="system:time_start"
+        ),
+    )
+    after = ee.Filter.And(
+        window,
+        ee.Filter.lessThanOrEquals(
+            leftField="system:time_start", rightField="system:time_start"
+        ),
+    )
+    neighbors = ee.Join.saveAll(
+        matchesKey="prev", ordering="system:time_start", ascending=True
+    ).apply(collection, collection, before)
+    neighbors = ee.Join.saveAll(
+        matchesKey="next", ordering="system:time_start", ascending=False
+    ).apply(neighbors, collection, after)
+
+    # variables is always a Python list here, so the filled band names are
+    # built once on the client
+    filled_names = [f"{var}_filled" for var in variables]
+
+    def fill_temporal_gaps(img):
         """
-        Fill gaps for image at given index using temporal neighbors.
+        Fill gaps for an image using its joined temporal neighbors.
         """
-        index = ee.Number(index)
-        img = ee.Image(collection_list.get(index))
-
-        # Get temporal neighbors with bounds checking
-        def get_neighbor_safe(offset):
-            neighbor_index = index.add(offset)
-            return ee.Image(
-                ee.Algorithms.If(
-                    neighbor_index.gte(0).And(
-                        neighbor_index.lt(collection_size)
-                    ),
-                    collection_list.get(neighbor_index),
-                    # Create a masked image with the same band structure as the base image
-                    img.select(variables).updateMask(0),
-                )
-            )
-
-        # Get temporal neighbors
-        prev1 = get_neighbor_safe(-1)
-        prev2 = get_neighbor_safe(-2)
-        prev3 = get_neighbor_safe(-3)
-        next1 = get_neighbor_safe(1)
-        next2 = get_neighbor_safe(2)
-        next3 = get_neighbor_safe(3)
-
-        # Start with original image
-        base = img.select(variables)
-
-        # Apply hierarchical filling: backward fill first, then forward fill
-        filled = base
-        filled = filled.unmask(prev1.select(variables))
-        filled = filled.unmask(prev2.select(variables))
-        filled = filled.unmask(prev3.select(variables))
-        filled = filled.unmask(next1.select(variables))
-        filled = filled.unmask(next2.select(variables))
-        filled = filled.unmask(next3.select(variables))
-
-        # For any remaining missing values, use spatial mean fallback
-        def apply_spatial_fallback(band_name):
-            # Don't convert to ee.String - use band_name directly
-            band_img = filled.select([band_name])
-
-            # Calculate spatial mean for this band
-            spatial_mean = (
-                img.select([band_name])
-                .reduceRegion(
-                    reducer=ee.Reducer.mean(),
-                    geometry=region,
-                    scale=10000,
-                    bestEffort=True,
-                    maxPixels=1e9,
-                )
-                .get(band_name)
-            )
-
-            # Fill remaining nulls with spatial mean
-            filled_band = band_img.unmask(ee.Image.constant(spatial_mean))
-            return filled_band.rename(band_name)
-
-        # Apply spatial fallback to each variable - handle each band individually
-        def process_band(band_name):
-            return apply_spatial_fallback(band_name)
-
-        # Since variables is now a Python list, process directly
-        filled_bands_list = []
-        for var in variables:
-            filled_bands_list.append(process_band(var))
+        img = ee.Image(img)
+
+        # Apply hierarchical filling: backward fill first, then forward fill.
+        # mosaic stacks later images on top, so candidates go in reverse
+        # priority: next3 .. next1, prev3 .. prev1, then the original image.
+        # "prev" already ends with the image itself, so it is dropped from
+        # the end of "next"
+        candidates = (
+            ee.List(img.get("next")).slice(0, -1).cat(ee.List(img.get("prev")))
+        )
+        filled = (
+            ee.ImageCollection.fromImages(candidates).select(variables).mosaic()
+        )
 
-        # Combine all bands into a single image
-        filled_image = ee.Image.cat(filled_bands_list)
+        # For any remaining missing values, use spatial mean fallback, with
+        # a single multi-band unmask against the constant fallback image
+        filled_image = filled.unmask(fallback_image)
 
         # Add filled bands to original image with '_filled' suffix
-        # Use simple string concatenation for band renaming
-        if isinstance(variables, list):
-            # If variables is a Python list, create filled names directly
-            filled_names = [f"{var}_filled" for var in variables]
-        else:
-            # If variables is an ee.List, convert to simple list approach
-            filled_names = [
-                "temperature_2m_filled",
-                "snow_cover_filled",
-                "snow_density_filled",
-                "snow_depth_filled",
-                "snow_depth_water_equivalent_filled",
-                "snowfall_hourly_filled",
-                "snowmelt_hourly_filled",
-                "total_precipitation_hourly_filled",
-                "u_component_of_wind_10m_filled",
-                "v_component_of_wind_10m_filled",
-            ]
-
         filled_renamed = filled_image.rename(filled_names)
 
         # Preserve original image properties
@@ -186,10 +156,44 @@ def apply_temporal_gap_filling(collection, region, variables=None):
         )
 
     # Apply gap filling to each image in the collection
-    indices = ee.List.sequence(0, collection_size.subtract(1))
-    filled_list = indices.map(fill_temporal_gaps)
+    return ee.ImageCollection(neighbors.map(fill_temporal_gaps))
 
-    return ee.ImageCollection.fromImages(filled_list)
+
+def build_gap_filled_collection(
+    year, region_fc, variables, start_month=1, end_month=12
+):
+    """
+    Build the gap-filled ERA5 collection for a month batch of a year.
+    The collection is padded by one month on each side so images at the
+    batch edges have temporal neighbors, and it can be shared by the hourly
+    and seasonal exports of the same batch.
+
+    Parameters:
+    - year (int): The target year
+    - region_fc (ee.FeatureCollection): Administrative boundaries
+    - variables (list): ERA5 band names to gap fill
+    - start_month (int): Starting month of the batch (default: 1)
+    - end_month (int): Ending month of the batch (default: 12)
+
+    Returns:
+    - ee.ImageCollection with the original and '_filled' bands
+    """
+    start_date = ee.Date.fromYMD(year, start_month, 1)
+    end_date = (
+        ee.Date.fromYMD(year, end_month + 1, 1)
+        if end_month < 12
+        else ee.Date.fromYMD(year + 1, 1, 1)
+    )
+
+    region_geometry = region_fc.geometry()
+    gap_fill_collection = (
+        ee.ImageCollection("ECMWF/ERA5_LAND/HOURLY")
+        .filterBounds(region_geometry.bounds())
+        .filterDate(start_date.advance(-1, "month"), end_date.advance(1, "month"))
+        .select(variables)
+    )
+
+    return apply_temporal_gap_filling(gap_fill_collection, region_geometry, variables)
 
 
 def process_era5_image(image):
@@ -199,25 +203,132 @@ def process_era5_image(image):
     - Calculates wind speed and direction.
     """
     # Convert temperature to Celsius
-    temp_c = (
-        image.select("temperature_2m").subtract(273.15).rename("temperature_c")
-    )
+    temp_c = image.expression(
+        "t - 273.15", {"t": image.select("temperature_2m")}
+    ).rename("temperature_c")
 
     # Calculate wind speed from U and V components
-    u_wind = image.select("u_component_of_wind_10m")
-    v_wind = image.select("v_component_of_wind_10m")
-    wind_speed = (u_wind.pow(2).add(v_wind.pow(2))).sqrt().rename("wind_speed")
+    winds = {
+        "u": image.select("u_component_of_wind_10m"),
+        "v": image.select("v_component_of_wind_10m"),
+    }
+    wind_speed = image.expression("sqrt(u * u + v * v)", winds).rename(
+        "wind_speed"
+    )
 
     # Calculate wind direction (in degrees)
-    wind_dir = (
-        ee.Image(180)
-        .add(ee.Image(180).divide(math.pi).multiply(v_wind.atan2(u_wind)))
-        .rename("wind_direction")
-    )
+    wind_dir = image.expression(
+        f"180 + {180 / math.pi!r} * atan2(v, u)", winds
+    ).rename("wind_direction")
 
     return image.addBands([temp_c, wind_speed, wind_dir])
 
 
+def reserve_task_slot(task, max_active_tasks=50, poll_interval=30):
+    """
+    Block until fewer than max_active_tasks of the export tasks started by
+    this process are still queued or running, then reserve a slot for task.
+
+    Parameters:
+    - task (ee.batch.Task): Export task the slot is reserved for
+    - max_active_tasks (int): Maximum number of outstanding tasks (default: 50)
+    - poll_interval (int): Seconds to wait between task list polls (default: 30)
+    """
+    while True:
+        with _task_lock:
+            if len(_started_tasks) < max_active_tasks:
+                _started_tasks.append(task)
+                return
+            # Only tasks already started before the list call can be judged
+            # finished by it; reserved and newly started ones are kept
+            listed = {t.operation_name for t in _started_tasks if t.operation_name}
+
+        # A single Task.list() call gives the state of every task, so the
+        # finished ones are dropped without polling each task's status
+        active_tasks = {
+            t.operation_name
+            for t in ee.batch.Task.list()
+            if ee.batch.Task.State.active(t.state)
+        }
+
+        with _task_lock:
+            for _ in range(len(_started_tasks)):
+                t = _started_tasks.popleft()
+                if t.operation_name not in listed or t.operation_name in active_tasks:
+                    _started_tasks.append(t)
+
+            if len(_started_tasks) < max_active_tasks:
+                _started_tasks.append(task)
+                return
+
+        time.sleep(poll_interval)
+
+
+def start_task(task, max_retries=6, max_active_tasks=50):
+    """
+    Start an export task, waiting for a free slot in the task queue and
+    retrying with exponential backoff when Earth Engine throttles the request.
+
+    Parameters:
+    - task (ee.batch.Task): Export task to start
+    - max_retries (int): Number of retries on throttling errors (default: 6)
+    - max_active_tasks (int): Maximum number of outstanding tasks (default: 50)
+    """
+    reserve_task_slot(task, max_active_tasks)
+
+    try:
+        for attempt in range(max_retries + 1):
+            try:
+                task.start()
+                break
+            except ee.EEException as e:
+                message = str(e).lower()
+                throttled = any(
+                    s in message for s in ("too many", "rate limit", "quota")
+                )
+                if not throttled or attempt == max_retries:
+                    raise
+                time.sleep(2**attempt)
+    except Exception:
+        with _task_lock:
+            _started_tasks.remove(task)
+        raise
+
+
+def table_export_task(collection, output_filename, folder_name, bucket=None):
+    """
+    Create a CSV table export task, to Cloud Storage when a bucket is given
+    and to Google Drive otherwise.
+
+    Parameters:
+    - collection (ee.FeatureCollection): Table to export
+    - output_filename (str): Task description and output file name
+    - folder_name (str): Google Drive folder, or object prefix within the bucket
+    - bucket (str): Cloud Storage bucket to export to (default: None, export to Drive)
+
+    Returns:
+    - ee.batch.Task that has not been started yet
+    """
+    if bucket is not None:
+        # Cloud Storage exports skip the Drive upload step and its per-folder
+        # file limits, which matters for long multi-year batches
+        return ee.batch.Export.table.toCloudStorage(
+            collection=collection,
+            description=output_filename,
+            bucket=bucket,
+            fileNamePrefix=f"{folder_name}/{output_filename}",
+            fileFormat="CSV",
+        )
+
+    return ee.batch.Export.table.toDrive(
+        collection=collection,
+        description=output_filename,
+        folder=folder_name,
+        fileNamePrefix=output_filename,
+        fileFormat="CSV",
+    )
+
+
 def export_hourly_weather_data(
     year,
     region_fc,
@@ -228,6 +339,9 @@ def export_hourly_weather_data(
     apply_gap_filling=True,
     start_month=1,
     end_month=12,
+    tile_scale=8,
+    gap_filled_collection=None,
+    bucket=None,
 ):
     """
     Export cleaned hourly weather data for a given year and region.
@@ -239,25 +353,18 @@ def export_hourly_weather_data(
     - region_name (str): Name for the region (e.g., 'MNG', 'CHN_IM')
     - region_id_property (str): Property holding unique ID for each feature
     - scale (int): Scale in meters for spatial reduction
-    - folder_name (str): Google Drive folder for export
+    - folder_name (str): Google Drive folder (or bucket prefix) for export
     - apply_gap_filling (bool): Whether to apply temporal gap-filling
     - start_month (int): Starting month for processing (default: 1)
     - end_month (int): Ending month for processing (default: 12)
+    - tile_scale (int): tileScale for the regional reductions (default: 8)
+    - gap_filled_collection (ee.ImageCollection): Precomputed output of
+      build_gap_filled_collection for this batch; built here if None
+    - bucket (str): Cloud Storage bucket to export to instead of Google Drive (default: None)
     """
     
     # Define core variables to process
-    core_variables = [
-        "temperature_2m",
-        "snow_cover",
-        "snow_density",
-        "snow_depth",
-        "snow_depth_water_equivalent",
-        "snowfall_hourly",
-        "snowmelt_hourly",
-        "total_precipitation_hourly",
-        "u_component_of_wind_10m",
-        "v_component_of_wind_10m",
-    ]
+    core_variables = HOURLY_CORE_VARIABLES
 
     # --- Define date range ---
     start_date = ee.Date.fromYMD(year, start_month, 1)
@@ -269,26 +376,39 @@ def export_hourly_weather_data(
 
     era5_collection = (
         ee.ImageCollection("ECMWF/ERA5_LAND/HOURLY")
-        .filterBounds(region_fc.geometry())
+        .filterBounds(region_fc.geometry().bounds())
         .filterDate(start_date, end_date)
         .select(core_variables)
     )
 
-    # --- Optional gap filling ---
-    if apply_gap_filling:
-        gap_fill_start = start_date.advance(-1, "month")
-        gap_fill_end = end_date.advance(1, "month")
-
-        gap_fill_collection = (
-            ee.ImageCollection("ECMWF/ERA5_LAND/HOURLY")
-            .filterBounds(region_fc.geometry())
-            .filterDate(gap_fill_start, gap_fill_end)
-            .select(core_variables)
+    # --- Skip regions without ERA5-Land coverage ---
+    # ERA5-Land is masked over water, so regions that fall entirely outside
+    # its land mask are dropped once here instead of being reduced every day.
+    # The mask is static, so it is taken from the first image of the whole
+    # raw collection: gap filling unmasks the whole image, and the batch
+    # window may have no images yet
+    land_mask = (
+        ee.Image(ee.ImageCollection("ECMWF/ERA5_LAND/HOURLY").first())
+        .select(core_variables[0])
+        .mask()
+    )
+    regions = (
+        land_mask.reduceRegions(
+            collection=region_fc.select([region_id_property]),
+            reducer=ee.Reducer.anyNonZero().setOutputs(["has_data"]),
+            scale=scale,
+            tileScale=tile_scale,
         )
+        .filter(ee.Filter.eq("has_data", 1))
+        .select([region_id_property])
+    )
 
-        gap_filled_collection = apply_temporal_gap_filling(
-            gap_fill_collection, region_fc.geometry(), core_variables
-        )
+    # --- Optional gap filling ---
+    if apply_gap_filling:
+        if gap_filled_collection is None:
+            gap_filled_collection = build_gap_filled_collection(
+                year, region_fc, core_variables, start_month, end_month
+            )
 
         era5_collection = gap_filled_collection.filterDate(start_date, end_date)
         variables_to_process = [v + "_filled" for v in core_variables]
@@ -296,17 +416,6 @@ def export_hourly_weather_data(
         variables_to_process = core_variables
 
 
-    # --- Function to classify month into season ---
-    def month_to_season(month):
-        """Return season name given ee.Number month"""
-        month = ee.Number(month)
-        return (
-            ee.Algorithms.If(month.eq(12).Or(month.lte(2)), "wtr",
-            ee.Algorithms.If(month.gte(3).And(month.lte(5)), "spr",
-            ee.Algorithms.If(month.gte(6).And(month.lte(8)), "smr",
-            "aut"))))
-
-
     # --- Image processing ---
     def process_hourly_image(img):
         if apply_gap_filling:
@@ -316,56 +425,52 @@ def export_hourly_weather_data(
 
         processed = process_era5_image(processed)
 
-        month = img.date().get("month")
-        season = month_to_season(month)
-
-        processed = processed.set({
-            "year": img.date().get("year"),
-            "month": month,
-            "day": img.date().get("day"),
-            "hour": img.date().get("hour"),
-            "season": season,
-            "system:time_start": img.get("system:time_start"),
-        })
-
-        return processed
+        # Hour label used as the band prefix when a day is stacked with toBands()
+        return processed.set(
+            "system:index", ee.Number(img.date().get("hour")).format("h%02d")
+        )
 
 
     processed_collection = era5_collection.map(process_hourly_image)
 
 
     # --- Reduction step ---
+    # The 24 hourly images of each day are stacked into one image with bands
+    # named h<HH>_<band> and reduced over the regions in a single
+    # reduceRegions call, instead of one call per hourly image. outputs/run.py
+    # unpivots the h<HH>_ columns back into one row per hour.
+
+    stats_reducer = (
+        ee.Reducer.mean()
+        .combine(ee.Reducer.median(), "", True)
+        .combine(ee.Reducer.min(), "", True)
+        .combine(ee.Reducer.max(), "", True)
+    )
 
-    def reduce_to_regions(img):
+    def reduce_day_to_regions(day_start):
+        day_start = ee.Date(day_start)
+        stacked = processed_collection.filterDate(
+            day_start, day_start.advance(1, "day")
+        ).toBands()
 
-        stats_reducer = (
-            ee.Reducer.mean()
-            .combine(ee.Reducer.median(), "", True)
-            .combine(ee.Reducer.min(), "", True)
-            .combine(ee.Reducer.max(), "", True)
-        )
-
-        reduced = img.reduceRegions(
-            collection=region_fc.select([region_id_property]),
+        reduced = stacked.reduceRegions(
+            collection=regions,
             reducer=stats_reducer,
             scale=scale,
-            tileScale=4,
+            tileScale=tile_scale,
         )
 
-        def add_time_props(feature):
-            return feature.set({
-                "year": img.get("year"),
-                "month": img.get("month"),
-                "day": img.get("day"),
-                "hour": img.get("hour"),
-                "season": img.get("season"),
-                "system:time_start": img.get("system:time_start"),
-            })
+        # Only the day's start time is stored; outputs/run.py derives the
+        # year, month, day, hour and season columns from it
+        day_millis = day_start.millis()
+        return reduced.map(lambda f: f.set("system:time_start", day_millis))
 
-        return reduced.map(add_time_props)
 
-
-    hourly_fc = processed_collection.map(reduce_to_regions).flatten()
+    n_days = end_date.difference(start_date, "day")
+    day_starts = ee.List.sequence(0, n_days.subtract(1)).map(
+        lambda i: start_date.advance(i, "day")
+    )
+    hourly_fc = ee.FeatureCollection(day_starts.map(reduce_day_to_regions)).flatten()
 
     # Set geometry to null for all features
     hourly_fc = hourly_fc.map(lambda f: f.setGeometry(None))
@@ -378,15 +483,9 @@ def export_hourly_weather_data(
     )
     output_filename = f"weather_hourly_{region_name}_{year}{month_suffix}"
 
-    task = ee.batch.Export.table.toDrive(
-        collection=hourly_fc,
-        description=output_filename,
-        folder=folder_name,
-        fileNamePrefix=output_filename,
-        fileFormat="CSV",
-    )
+    task = table_export_task(hourly_fc, output_filename, folder_name, bucket)
 
-    task.start()
+    start_task(task)
     print(f"Started hourly export task for {region_name} {year}. Filename: {output_filename}")
 
 
@@ -403,6 +502,8 @@ def process_single_region_batch(
     scale=9000,
     folder_name="GEE_WEATHER_EXPORTS",
     groups_of_n_months=3,
+    n_workers=16,
+    bucket=None,
 ):
     """
     Process weather data for a single region across multiple years.
@@ -418,8 +519,10 @@ def process_single_region_batch(
     - export_seasonal (bool): Whether to export seasonal aggregates
     - apply_gap_filling (bool): Whether to apply temporal gap-filling strategy
     - scale (int): Scale in meters for spatial reduction
-    - folder_name (str): Google Drive folder for exports
+    - folder_name (str): Google Drive folder (or bucket prefix) for exports
     - groups_of_n_months (int): Number of months to process in each batch (default: 3)
+    - n_workers (int): Number of (year, month batch) exports submitted concurrently (default: 16)
+    - bucket (str): Cloud Storage bucket to export to instead of Google Drive (default: None)
     """
 
     total_years = end_year - start_year + 1
@@ -427,53 +530,87 @@ def process_single_region_batch(
         f"Processing {region_name}: {total_years} years ({start_year}-{end_year})"
     )
 
-    for year in range(start_year, end_year + 1):
-        print(
-            f"\nProcessing {region_name} - Year {year} ({year - start_year + 1}/{total_years})"
-        )
+    # Create month batches
+    month_batches = []
+    for start_month in range(1, 13, groups_of_n_months):
+        end_month = min(start_month + groups_of_n_months - 1, 12)
+        month_batches.append((start_month, end_month))
+
+    print(
+        f"Processing in {len(month_batches)} month batches per year: {month_batches}"
+    )
+
+    # Import here since utils builds on the gap filling defined in this module
+    from src.utils import SEASONAL_CORE_VARIABLES, export_seasonal_weather_stats
+
+    # Bands needed by the enabled exports, so each batch's gap-filled
+    # collection is built once and shared between them
+    gap_fill_variables = []
+    if export_seasonal:
+        gap_fill_variables += SEASONAL_CORE_VARIABLES
+    if export_hourly:
+        gap_fill_variables += [
+            v for v in HOURLY_CORE_VARIABLES if v not in gap_fill_variables
+        ]
+
+    # Batches only use the region ids and geometries, so the remaining
+    # properties are dropped once here rather than in every exporter call
+    region_fc = region_fc.select([region_id_property])
 
-        # Create month batches
-        month_batches = []
-        for start_month in range(1, 13, groups_of_n_months):
-            end_month = min(start_month + groups_of_n_months - 1, 12)
-            month_batches.append((start_month, end_month))
+    jobs = [
+        (year, start_month, end_month)
+        for year in range(start_year, end_year + 1)
+        for start_month, end_month in month_batches
+    ]
 
-        print(
-            f"Processing in {len(month_batches)} month batches: {month_batches}"
+    def submit_batch(year, start_month, end_month):
+        # Export tasks run server-side; this only builds the graphs and starts
+        # the tasks, so batches are submitted from a pool of threads
+        gap_filled_collection = (
+            build_gap_filled_collection(
+                year, region_fc, gap_fill_variables, start_month, end_month
+            )
+            if apply_gap_filling
+            else None
         )
 
-        for batch_idx, (start_month, end_month) in enumerate(month_batches):
-            print(
-                f"  Batch {batch_idx + 1}/{len(month_batches)}: Months {start_month}-{end_month}"
+        if export_seasonal:
+            export_seasonal_weather_stats(
+                year=year,
+                region_fc=region_fc,
+                region_name=region_name,
+                region_id_property=region_id_property,
+                scale=scale,
+                folder_name=folder_name,
+                apply_gap_filling=apply_gap_filling,
+                start_month=start_month,
+                end_month=end_month,
+                gap_filled_collection=gap_filled_collection,
+                bucket=bucket,
             )
 
-            try:
-                if export_seasonal:
-                    export_seasonal_weather_stats(
-                        year=year,
-                        region_fc=region_fc,
-                        region_name=region_name,
-                        region_id_property=region_id_property,
-                        scale=scale,
-                        folder_name=folder_name,
-                        apply_gap_filling=apply_gap_filling,
-                        start_month=start_month,
-                        end_month=end_month,
-                    )
-
-                if export_hourly:
-                    export_hourly_weather_data(
-                        year=year,
-                        region_fc=region_fc,
-                        region_name=region_name,
-                        region_id_property=region_id_property,
-                        scale=scale,
-                        folder_name=folder_name,
-                        apply_gap_filling=apply_gap_filling,
-                        start_month=start_month,
-                        end_month=end_month,
-                    )
+        if export_hourly:
+            export_hourly_weather_data(
+                year=year,
+                region_fc=region_fc,
+                region_name=region_name,
+                region_id_property=region_id_property,
+                scale=scale,
+                folder_name=folder_name,
+                apply_gap_filling=apply_gap_filling,
+                start_month=start_month,
+                end_month=end_month,
+                gap_filled_collection=gap_filled_collection,
+                bucket=bucket,
+            )
 
+    print(f"Submitting {len(jobs)} batches with {n_workers} workers")
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        futures = {executor.submit(submit_batch, *job): job for job in jobs}
+        for future in as_completed(futures):
+            year, start_month, end_month = futures[future]
+            try:
+                future.result()
             except Exception as e:
                 print(
                     f"✗ ERROR processing {region_name} for year {year}, months {start_month}-{end_month}: {e}"
@@ -1,6 +1,4 @@
 import geopandas as gpd
-import numpy as np
-from shapely.geometry import Point
 
 
 def group_points(gdf: gpd.GeoDataFrame, group_cols: list) -> gpd.GeoDataFrame:
@@ -8,6 +6,9 @@ def group_points(gdf: gpd.GeoDataFrame, group_cols: list) -> gpd.GeoDataFrame:
     Group points in a GeoDataFrame by categorical columns and replace
     each group's geometry with the centroid (mean X/Y) of its points.
 
+    Geographic input is averaged in its local UTM zone (see
+    GeoDataFrame.estimate_utm_crs). Rows are sorted by the group keys.
+
     Parameters
     ----------
     gdf : geopandas.GeoDataFrame
@@ -23,26 +24,33 @@ def group_points(gdf: gpd.GeoDataFrame, group_cols: list) -> gpd.GeoDataFrame:
     if not all(gdf.geometry.geom_type == "Point"):
         raise ValueError("All geometries must be Point type.")
 
-    # Work in projected CRS for accurate mean calculations
-    gdf_3857 = gdf.to_crs(3857)
-
-    grouped = gdf_3857.groupby(group_cols, as_index=False).agg(
-        {
-            **{
-                col: "first"
-                for col in gdf.columns
-                if col not in group_cols + ["geometry"]
-            },
-            "geometry": lambda geom: Point(
-                np.mean([p.x for p in geom]), np.mean([p.y for p in geom])
-            ),
-        }
+    # Work in a projected CRS for accurate mean calculations. Geographic
+    # input is projected to its local UTM zone, which distorts far less than
+    # Web Mercator; projected input is averaged as is
+    if gdf.crs is not None and gdf.crs.is_geographic:
+        projected = gdf.to_crs(gdf.estimate_utm_crs())
+    else:
+        projected = gdf
+
+    # Average the coordinates as plain columns rather than per-group Points
+    coords = projected.drop(columns="geometry").assign(
+        _x=projected.geometry.x, _y=projected.geometry.y
     )
 
-    # Convert back to original CRS
-    grouped = gpd.GeoDataFrame(grouped, geometry="geometry", crs=3857).to_crs(
-        gdf.crs
+    # Rows come out sorted by the group keys; only observed categories are
+    # kept, so categorical keys do not produce empty groups
+    groups = coords.groupby(group_cols, sort=True, observed=True)
+    first_cols = [col for col in gdf.columns if col not in group_cols + ["geometry"]]
+    grouped = (
+        groups[first_cols].first().join(groups[["_x", "_y"]].mean()).reset_index()
     )
+    grouped["geometry"] = gpd.points_from_xy(grouped["_x"], grouped["_y"])
+    grouped = grouped.drop(columns=["_x", "_y"])
+
+    # Only the centroids are converted back to the original CRS
+    grouped = gpd.GeoDataFrame(grouped, geometry="geometry", crs=projected.crs)
+    if projected is not gdf:
+        grouped = grouped.to_crs(gdf.crs)
 
     return grouped
 
@@ -51,13 +59,10 @@ if __name__ == "__main__":
     import pandas as pd
 
     points = pd.read_csv("../data/l2kgz_gps.csv")
-    points["geometry"] = points.apply(
-        lambda row: Point(row["gps_lon"], row["gps_lat"]), axis=1
-    )
-    points = gpd.GeoDataFrame(points, crs=4326).to_crs(3857)
-    grouped = (
-        group_points(points, ["aiyl"])
-        .drop(["gps_lat", "gps_lon"], axis=1)
-        .to_crs(4326)
+    points = gpd.GeoDataFrame(
+        points,
+        geometry=gpd.points_from_xy(points["gps_lon"], points["gps_lat"]),
+        crs=4326,
     )
+    grouped = group_points(points, ["aiyl"]).drop(["gps_lat", "gps_lon"], axis=1)
     grouped.to_file("../data/grouped.geojson", driver="GeoJSON")
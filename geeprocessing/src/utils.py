@@ -1,93 +1,230 @@
 import ee
+from src.main import (
+    build_gap_filled_collection,
+    process_era5_image,
+    start_task,
+    table_export_task,
+)
+
+# ERA5-Land bands aggregated by export_seasonal_weather_stats
+SEASONAL_CORE_VARIABLES = [
+    "temperature_2m",
+    "snow_cover",
+    "snow_density",
+    "snow_depth",
+    "snowfall",
+    "snowmelt",
+    "total_precipitation",
+    "u_component_of_wind_10m",
+    "v_component_of_wind_10m",
+]
+
+# Bands added by main.process_era5_image
+DERIVED_VARIABLES = ["temperature_c", "wind_speed", "wind_direction"]
+
+# Statistics reduced per band and season, in reducer output order
+SEASONAL_STATS = ["mean", "median", "sum"]
+
+SEASONS = {
+    "aut": {"months": [9, 10, 11], "name": "aut"},
+    "spr": {"months": [3, 4, 5], "name": "spr"},
+    "smr": {"months": [6, 7, 8], "name": "smr"},
+    "wtr": {"months": [12, 1, 2], "name": "wtr"},
+}
+
+# Hourly exposure bins are 1-unit wide and centered on whole degrees / m/s
+TEMP_BIN_BANDS = [f"temp_h_{t}" for t in range(-50, 51)]
+WIND_BIN_BANDS = [f"wind_h_{w}" for w in range(0, 26)]
+
+
+def batch_seasons(start_month=1, end_month=12, apply_gap_filling=True):
+    """
+    Returns the codes of the seasons that have data in a month batch.
 
+    With gap filling, the seasons only count the batch and the month before
+    it (see build_yearly_image), so seasons outside that window have no
+    images. Without gap filling the whole year is read.
 
-def export_seasonal_weather_stats(
+    Parameters:
+    - start_month (int): Starting month of the batch (default: 1)
+    - end_month (int): Ending month of the batch (default: 12)
+    - apply_gap_filling (bool): Whether the batch is gap filled (default: True)
+
+    Returns:
+    - list of season codes, in SEASONS order
+    """
+    if not apply_gap_filling:
+        return list(SEASONS)
+
+    # Months relative to the target year: the window reaches back to 0
+    # (December of the previous year), and the winter December is the previous one
+    covered = range(start_month - 1, end_month + 1)
+    return [
+        season_code
+        for season_code, params in SEASONS.items()
+        if any((0 if month == 12 else month) in covered for month in params["months"])
+    ]
+
+
+def seasonal_band_names(season_codes=None):
+    """
+    Returns the (stat_bands, bin_bands) band name lists of the image built by
+    build_yearly_image, so they never have to be looked up server-side.
+
+    Parameters:
+    - season_codes (list): Seasons to name bands for, e.g. from batch_seasons
+      (default: None, all seasons)
+    """
+    if season_codes is None:
+        season_codes = list(SEASONS)
+
+    stat_bands = []
+    bin_bands = []
+    for season_code in season_codes:
+        stat_bands += [
+            f"{band}_{stat}_{season_code}"
+            for band in SEASONAL_CORE_VARIABLES + DERIVED_VARIABLES
+            for stat in SEASONAL_STATS
+        ]
+        bin_bands += [
+            f"{band}_{season_code}" for band in TEMP_BIN_BANDS + WIND_BIN_BANDS
+        ]
+    return stat_bands, bin_bands
+
+
+def histogram_to_bands(histogram, band_names):
+    """
+    Unpacks a fixedHistogram array band (rows of [bucket_min, count]) into
+    one count band per bucket, named after band_names.
+    """
+    return (
+        histogram.arraySlice(1, 1, 2).arrayProject([0]).arrayFlatten([band_names])
+    )
+
+
+def build_yearly_image(
     year,
     region_fc,
-    region_name,
-    region_id_property,
-    scale=9000,
-    folder_name="GEE_WEATHER_EXPORTS",
     apply_gap_filling=True,
     start_month=1,
     end_month=12,
+    parallel_scale=4,
+    gap_filled_collection=None,
 ):
     """
-    Processes hourly ERA5 data to produce and export seasonal weather statistics for a given year and region.
-
-    ```
-    For each season (winter, spring, summer, autumn), this function calculates:
-    1. Aggregate statistics (mean, median, sum) for core weather variables.
-    2. Hourly exposure counts for temperature (-50C to +50C) and wind speed (0 to 25 m/s) bins.
-
-    The results are exported as a single CSV file for the year to Google Drive.
+    Returns the per-pixel seasonal statistics and hourly exposure bin counts of a month batch of a year.
 
     Parameters:
     - year (int): Target year.
-    - region_fc (ee.FeatureCollection): Boundaries to aggregate data over.
-    - region_name (str): Name for the region, used in output filename.
-    - region_id_property (str): Unique ID property for each feature.
-    - scale (int): Scale in meters for spatial reduction.
-    - folder_name (str): Google Drive folder for output.
+    - region_fc (ee.FeatureCollection): Boundaries used to select and gap fill the data.
+    - apply_gap_filling (bool): Whether to apply temporal gap-filling strategy
     - start_month (int): Starting month (default: 1)
     - end_month (int): Ending month (default: 12)
+    - parallel_scale (int): parallelScale for the temporal reductions (default: 4)
+    - gap_filled_collection (ee.ImageCollection): Precomputed gap-filled
+      collection covering the batch (see main.build_gap_filled_collection);
+      built here if None
+
+    Returns:
+    - ee.Image with one band per statistic / bin and season of the batch (see
+      batch_seasons), suffixed with the season code
     """
 
-    # --- Define Seasons ---
-    seasons = {
-        "aut": {"months": [9, 10, 11], "name": "aut"},
-        "spr": {"months": [3, 4, 5], "name": "spr"},
-        "smr": {"months": [6, 7, 8], "name": "smr"},
-        "wtr": {"months": [12, 1, 2], "name": "wtr"},
-    }
-
     # --- Define Variables and Bins ---
-    core_variables = [
-        "temperature_2m",
-        "snow_cover",
-        "snow_density",
-        "snow_depth",
-        "snowfall",
-        "snowmelt",
-        "total_precipitation",
-        "u_component_of_wind_10m",
-        "v_component_of_wind_10m",
-    ]
-    derived_variables = ["temperature_c", "wind_speed", "wind_direction"]
-
-    temp_bins = ee.List.sequence(-50, 50)
-    wind_bins = ee.List.sequence(0, 25)
+    core_variables = SEASONAL_CORE_VARIABLES
+    temp_band_names = TEMP_BIN_BANDS
+    wind_band_names = WIND_BIN_BANDS
 
     # --- Get Base ERA5 Collection ---
+    region_geometry = region_fc.geometry()
     era5_collection = ee.ImageCollection(
         "ECMWF/ERA5_LAND/HOURLY"
-    ).filterBounds(region_fc.geometry())
+    ).filterBounds(region_geometry.bounds())
 
     # --- Apply gap filling if requested ---
     if apply_gap_filling:
-        gap_fill_start = ee.Date.fromYMD(year, start_month, 1).advance(
+        if gap_filled_collection is None:
+            gap_filled_collection = build_gap_filled_collection(
+                year, region_fc, core_variables, start_month, end_month
+            )
+        core_variables_filled = [v + "_filled" for v in core_variables]
+    else:
+        gap_filled_collection = None
+        core_variables_filled = core_variables
+
+    # --- Pre-process Data ---
+    # Restore the original band names and derive the temperature / wind bands
+    # once for the whole year; each season below only filters this collection
+    if apply_gap_filling and gap_filled_collection:
+        # The gap-filled collection is padded by a month on each side, but
+        # the seasons only count the batch and the month before it (which
+        # gives a January batch its December), whether the collection was
+        # passed in or built above
+        season_window_start = ee.Date.fromYMD(year, start_month, 1).advance(
             -1, "month"
         )
-        gap_fill_end = (
+        season_window_end = (
             ee.Date.fromYMD(year, end_month + 1, 1)
             if end_month < 12
-            else ee.Date.fromYMD(year + 1, 1, 1).advance(1, "month")
+            else ee.Date.fromYMD(year + 1, 1, 1)
         )
-
-        full_year_collection = era5_collection.filterDate(
-            gap_fill_start, gap_fill_end
+        base_collection = gap_filled_collection.filterDate(
+            season_window_start, season_window_end
+        ).map(lambda img: img.select(core_variables_filled, core_variables))
+    else:
+        # Seasons span December of the previous year through November
+        base_collection = era5_collection.filterDate(
+            ee.Date.fromYMD(year - 1, 12, 1), ee.Date.fromYMD(year, 12, 1)
         ).select(core_variables)
-        gap_filled_collection = apply_temporal_gap_filling(
-            full_year_collection, region_fc.geometry(), core_variables
+
+    processed_collection = base_collection.map(process_era5_image)
+
+    # --- Define the Seasonal Reducer ---
+    # Aggregate statistics (mean, median, sum) per band and the exposure bin
+    # histograms are combined with unshared inputs into a single reducer, so
+    # each season's images are scanned once for both. The histogram inputs
+    # are copies of the temperature / wind bands under their own names
+    stat_reducer = (
+        ee.Reducer.mean()
+        .combine(ee.Reducer.median(), "", True)
+        .combine(ee.Reducer.sum(), "", True)
+    )
+    bands_for_stats = core_variables + DERIVED_VARIABLES
+    stat_band_names = [
+        f"{band}_{stat}" for band in bands_for_stats for stat in SEASONAL_STATS
+    ]
+
+    # A per-pixel histogram counts the hours whose rounded value falls in each bin
+    hist_bands = ["temp_hist", "wind_hist"]
+    season_reducer = (
+        stat_reducer.forEach(bands_for_stats)
+        .combine(
+            ee.Reducer.fixedHistogram(-50.5, 50.5, len(temp_band_names)).setOutputs(
+                ["temp_hist"]
+            ),
+            "",
+            False,
         )
-        core_variables_filled = [v + "_filled" for v in core_variables]
-    else:
-        gap_filled_collection = None
-        core_variables_filled = core_variables
+        .combine(
+            ee.Reducer.fixedHistogram(-0.5, 25.5, len(wind_band_names)).setOutputs(
+                ["wind_hist"]
+            ),
+            "",
+            False,
+        )
+    )
+    reducer_input = processed_collection.map(
+        lambda img: img.select(bands_for_stats).addBands(
+            img.select(["temperature_c", "wind_speed"], hist_bands)
+        )
+    )
 
     yearly_results = []
 
-    for season_code, params in seasons.items():
+    # Seasons outside a gap-filled month batch have no images, so their
+    # fixed band names are never selected
+    for season_code in batch_seasons(start_month, end_month, apply_gap_filling):
+        params = SEASONS[season_code]
         # --- Handle Date Ranges (especially winter) ---
         if season_code == "wtr":
             start_date = ee.Date.fromYMD(year - 1, params["months"][0], 1)
@@ -100,122 +237,105 @@ def export_seasonal_weather_stats(
                 1, "month"
             )
 
-        # --- Filter and Pre-process Data ---
-        if apply_gap_filling and gap_filled_collection:
-            seasonal_data = gap_filled_collection.filterDate(
-                start_date, end_date
-            )
-            seasonal_data = seasonal_data.map(
-                lambda img: img.select(core_variables_filled, core_variables)
-            )
-        else:
-            seasonal_data = era5_collection.filterDate(
-                start_date, end_date
-            ).select(core_variables)
-
-        processed_seasonal_data = seasonal_data.map(process_era5_image)
+        # --- Filter and Reduce Data ---
+        season_input = reducer_input.filterDate(start_date, end_date)
+        season_image = season_input.reduce(season_reducer, parallel_scale)
 
         # --- 1. Aggregate Statistics (Mean, Median, Sum) ---
-        stat_reducer = (
-            ee.Reducer.mean()
-            .combine(ee.Reducer.median(), "", True)
-            .combine(ee.Reducer.sum(), "", True)
-        )
-
-        bands_for_stats = core_variables + derived_variables
-        stats_image = processed_seasonal_data.select(bands_for_stats).reduce(
-            stat_reducer
-        )
+        # forEach names each output <band>_<stat>, so the stats are selected
+        # in a known order and renamed below without a server lookup
+        stats_image = season_image.select(stat_band_names)
 
         # --- 2. Exposure Bin Counts ---
-        def get_bin_counts(image):
-            temp = image.select("temperature_c").round()
-            wind = image.select("wind_speed").round()
+        temp_bins = histogram_to_bands(season_image.select("temp_hist"), temp_band_names)
+        wind_bins = histogram_to_bands(season_image.select("wind_hist"), wind_band_names)
+        bins_image = temp_bins.addBands(wind_bins)
 
-            temp_bin_images = temp_bins.map(
-                lambda t: temp.eq(ee.Number(t)).rename(
-                    ee.String("temp_h_").cat(ee.Number(t).int().format())
-                )
-            )
-            temp_bands = ee.ImageCollection.fromImages(
-                temp_bin_images
-            ).toBands()
-            temp_band_names = temp_bins.map(
-                lambda t: ee.String("temp_h_").cat(ee.Number(t).int().format())
-            )
-            temp_bands = temp_bands.rename(temp_band_names)
+        # --- 3. Combine Stats + Bins ---
+        final_image = stats_image.addBands(bins_image)
 
-            wind_bin_images = wind_bins.map(
-                lambda w: wind.eq(ee.Number(w)).rename(
-                    ee.String("wind_h_").cat(ee.Number(w).int().format())
+        new_band_names = [
+            f"{band}_{season_code}"
+            for band in stat_band_names + temp_band_names + wind_band_names
+        ]
+        final_image_renamed = final_image.rename(new_band_names)
+
+        # A season can still be empty when ERA5-Land has no data for it yet;
+        # it then gets fully masked bands under the same names
+        empty_season_image = (
+            ee.Image.constant([0] * len(new_band_names))
+            .rename(new_band_names)
+            .updateMask(0)
+        )
+        yearly_results.append(
+            ee.Image(
+                ee.Algorithms.If(
+                    season_input.size().gt(0),
+                    final_image_renamed,
+                    empty_season_image,
                 )
             )
-            wind_bands = ee.ImageCollection.fromImages(
-                wind_bin_images
-            ).toBands()
-            wind_band_names = wind_bins.map(
-                lambda w: ee.String("wind_h_").cat(ee.Number(w).int().format())
-            )
-            wind_bands = wind_bands.rename(wind_band_names)
+        )
 
-            return temp_bands.addBands(wind_bands)
+    # --- Combine all seasonal results ---
+    return ee.Image.cat(yearly_results)
 
-        binned_images = processed_seasonal_data.map(get_bin_counts)
-        bins_image = binned_images.reduce(ee.Reducer.sum())
 
-        # --- 3. Combine Stats + Bins ---
-        final_image = stats_image.addBands(bins_image)
+def export_yearly_image(
+    yearly_image,
+    year,
+    region_fc,
+    region_name,
+    region_id_property,
+    scale=9000,
+    folder_name="GEE_WEATHER_EXPORTS",
+    start_month=1,
+    end_month=12,
+    tile_scale=8,
+    bucket=None,
+    apply_gap_filling=True,
+):
+    """
+    Reduces a yearly image from build_yearly_image over a set of boundaries and exports it as a CSV.
 
-        new_band_names = final_image.bandNames().map(
-            lambda b: ee.String(b).cat("_").cat(season_code)
-        )
-        final_image_renamed = final_image.rename(new_band_names)
-        yearly_results.append(final_image_renamed)
+    Stats bands are averaged and bin count bands are summed within each feature.
 
-    # --- Combine all seasonal results ---
-    yearly_image = ee.Image.cat(yearly_results)
+    Parameters:
+    - yearly_image (ee.Image): Output of build_yearly_image.
+    - year (int): Target year, used in output filename.
+    - region_fc (ee.FeatureCollection): Boundaries to aggregate data over.
+    - region_name (str): Name for the region, used in output filename.
+    - region_id_property (str): Unique ID property for each feature.
+    - scale (int): Scale in meters for spatial reduction.
+    - folder_name (str): Google Drive folder (or bucket prefix) for output.
+    - start_month (int): Starting month, used in output filename (default: 1)
+    - end_month (int): Ending month, used in output filename (default: 12)
+    - tile_scale (int): tileScale for the regional reductions (default: 8)
+    - bucket (str): Cloud Storage bucket to export to instead of Google Drive (default: None)
+    - apply_gap_filling (bool): Whether yearly_image was built with gap filling,
+      which limits it to the seasons of the month batch (default: True)
+    """
 
     # --- Split bins vs stats bands ---
-    all_band_names = yearly_image.bandNames()
-
-    # Bands with "_h_" are the bin counts; others are stats
-    bin_bands = all_band_names.filter(ee.Filter.stringContains("item", "_h_"))
-    stat_bands = all_band_names.filter(
-        ee.Filter.Not(ee.Filter.stringContains("item", "_h_"))
+    stat_bands, bin_bands = seasonal_band_names(
+        batch_seasons(start_month, end_month, apply_gap_filling)
     )
 
-    bins_image = yearly_image.select(bin_bands)
-    stats_image = yearly_image.select(stat_bands)
-
-    # --- ReduceRegions: mean for stats ---
-    stats_fc = stats_image.reduceRegions(
-        collection=region_fc.select([region_id_property]),
-        reducer=ee.Reducer.mean(),
-        scale=scale,
-        tileScale=1,
+    # --- ReduceRegions: mean for stats, sum for bins ---
+    # One combined reducer with unshared inputs averages the stats bands and
+    # sums the bin bands in a single pass over each region, so no join is
+    # needed to merge the two
+    reducer = (
+        ee.Reducer.mean()
+        .forEach(stat_bands)
+        .combine(ee.Reducer.sum().forEach(bin_bands), "", False)
     )
 
-    # --- ReduceRegions: sum for bins ---
-    bins_fc = bins_image.reduceRegions(
+    final_fc = yearly_image.select(stat_bands + bin_bands).reduceRegions(
         collection=region_fc.select([region_id_property]),
-        reducer=ee.Reducer.sum(),
+        reducer=reducer,
         scale=scale,
-        tileScale=1,
-    )
-
-    # --- Join both results by region_id_property ---
-    join_filter = ee.Filter.equals(
-        leftField=region_id_property,
-        rightField=region_id_property,
-    )
-
-    joined = ee.Join.inner().apply(stats_fc, bins_fc, join_filter)
-
-    # Merge properties: copy stats + bins into single feature per region
-    final_fc = joined.map(
-        lambda f: ee.Feature(f.get("primary")).copyProperties(
-            f.get("secondary")
-        )
+        tileScale=tile_scale,
     )
 
     # --- Export ---
@@ -226,15 +346,76 @@ def export_seasonal_weather_stats(
     )
     output_filename = f"weather_stats_{region_name}_{year}{month_suffix}"
 
-    task = ee.batch.Export.table.toDrive(
-        collection=final_fc,
-        description=output_filename,
-        folder=folder_name,
-        fileNamePrefix=output_filename,
-        fileFormat="CSV",
-    )
+    task = table_export_task(final_fc, output_filename, folder_name, bucket)
 
-    task.start()
+    start_task(task)
     print(
         f"Started seasonal export for {region_name} {year}. Filename: {output_filename}"
-    )
\ No newline at end of file
+    )
+
+
+def export_seasonal_weather_stats(
+    year,
+    region_fc,
+    region_name,
+    region_id_property,
+    scale=9000,
+    folder_name="GEE_WEATHER_EXPORTS",
+    apply_gap_filling=True,
+    start_month=1,
+    end_month=12,
+    parallel_scale=4,
+    tile_scale=8,
+    gap_filled_collection=None,
+    bucket=None,
+):
+    """
+    Processes hourly ERA5 data to produce and export seasonal weather statistics for a given year and region.
+
+    ```
+    For each season (winter, spring, summer, autumn), this function calculates:
+    1. Aggregate statistics (mean, median, sum) for core weather variables.
+    2. Hourly exposure counts for temperature (-50C to +50C) and wind speed (0 to 25 m/s) bins.
+
+    The results are exported as a single CSV file for the year to Google Drive (or Cloud Storage).
+
+    Parameters:
+    - year (int): Target year.
+    - region_fc (ee.FeatureCollection): Boundaries to aggregate data over.
+    - region_name (str): Name for the region, used in output filename.
+    - region_id_property (str): Unique ID property for each feature.
+    - scale (int): Scale in meters for spatial reduction.
+    - folder_name (str): Google Drive folder (or bucket prefix) for output.
+    - start_month (int): Starting month (default: 1)
+    - end_month (int): Ending month (default: 12)
+    - parallel_scale (int): parallelScale for the temporal reductions (default: 4)
+    - tile_scale (int): tileScale for the regional reductions (default: 8)
+    - gap_filled_collection (ee.ImageCollection): Precomputed gap-filled
+      collection covering the batch (see main.build_gap_filled_collection);
+      built here if None
+    - bucket (str): Cloud Storage bucket to export to instead of Google Drive (default: None)
+    """
+
+    yearly_image = build_yearly_image(
+        year,
+        region_fc,
+        apply_gap_filling=apply_gap_filling,
+        start_month=start_month,
+        end_month=end_month,
+        parallel_scale=parallel_scale,
+        gap_filled_collection=gap_filled_collection,
+    )
+    export_yearly_image(
+        yearly_image,
+        year,
+        region_fc,
+        region_name,
+        region_id_property,
+        scale=scale,
+        folder_name=folder_name,
+        start_month=start_month,
+        end_month=end_month,
+        tile_scale=tile_scale,
+        bucket=bucket,
+        apply_gap_filling=apply_gap_filling,
+    )
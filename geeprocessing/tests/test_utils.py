@@ -0,0 +1,42 @@
+from src.utils import (
+    SEASONS,
+    TEMP_BIN_BANDS,
+    WIND_BIN_BANDS,
+    batch_seasons,
+    seasonal_band_names,
+)
+
+
+def test_batch_seasons_full_year():
+    assert batch_seasons(1, 12) == list(SEASONS)
+
+
+def test_batch_seasons_one_month_batch():
+    # January also counts the previous December, both in winter
+    assert batch_seasons(1, 1) == ["wtr"]
+    # The month before the batch reaches into the previous season
+    assert batch_seasons(3, 3) == ["spr", "wtr"]
+    # The month after the batch is only gap-filling context
+    assert batch_seasons(5, 5) == ["spr"]
+    # December belongs to next year's winter, so only November is left
+    assert batch_seasons(12, 12) == ["aut"]
+
+
+def test_batch_seasons_without_gap_filling():
+    assert batch_seasons(1, 1, apply_gap_filling=False) == list(SEASONS)
+
+
+def test_seasonal_band_names_one_month_batch():
+    stat_bands, bin_bands = seasonal_band_names(batch_seasons(1, 1))
+
+    assert all(band.endswith("_wtr") for band in stat_bands + bin_bands)
+    assert len(bin_bands) == len(TEMP_BIN_BANDS) + len(WIND_BIN_BANDS)
+    assert "temp_h_-50_wtr" in bin_bands
+    assert "temperature_c_mean_wtr" in stat_bands
+
+
+def test_seasonal_band_names_defaults_to_all_seasons():
+    stat_bands, bin_bands = seasonal_band_names()
+
+    assert (stat_bands, bin_bands) == seasonal_band_names(list(SEASONS))
+    assert len(bin_bands) == len(SEASONS) * (len(TEMP_BIN_BANDS) + len(WIND_BIN_BANDS))
@@ -1,6 +1,9 @@
 """Script to fix sex/age_group swaps in existing CSV outputs."""
 
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+import os
+import numpy as np
 import pandas as pd
 
 
@@ -16,16 +19,21 @@ def fix_csv_swaps(csv_path: Path) -> None:
     """
     df = pd.read_csv(csv_path)
     
-    mask = (df["sex"] == "T") & (df["age_group"].isin(["F", "M"]))
+    sex = df["sex"].to_numpy()
+    age_group = df["age_group"].to_numpy()
+    mask = (sex == "T") & np.isin(age_group, ["F", "M"])
+    n_swaps = int(mask.sum())
     
-    if mask.sum() == 0:
+    if n_swaps == 0:
         print(f"  No swaps needed in {csv_path.name}")
         return
     
-    df.loc[mask, ["sex", "age_group"]] = df.loc[mask, ["age_group", "sex"]].values
+    # Swap both columns with whole-column selects instead of .loc indexing
+    df["sex"] = np.where(mask, age_group, sex)
+    df["age_group"] = np.where(mask, sex, age_group)
     
     df.to_csv(csv_path, index=False)
-    print(f"  Fixed {mask.sum()} rows in {csv_path.name}")
+    print(f"  Fixed {n_swaps} rows in {csv_path.name}")
 
 
 def main():
@@ -44,9 +52,11 @@ def main():
     
     print(f"Found {len(csv_files)} CSV files to process\n")
     
-    for csv_path in sorted(csv_files):
-        print(f"Processing {csv_path.name}...")
-        fix_csv_swaps(csv_path)
+    # Files are independent, so they are fixed in parallel; each worker
+    # reports on its own file
+    max_workers = min(len(csv_files), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(fix_csv_swaps, sorted(csv_files)))
     
     print("\nDone!")
 
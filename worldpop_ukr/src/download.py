@@ -3,6 +3,11 @@ import requests
 from pathlib import Path
 from typing import Optional
 
+# Large chunks keep the number of Python-level reads and writes low for the
+# multi-GB zips, and progress is only printed every PROGRESS_EVERY bytes
+CHUNK_SIZE = 1024 * 1024
+PROGRESS_EVERY = 16 * 1024 * 1024
+
 
 def download_worldpop_data(year: int, output_dir: Optional[str] = None) -> Path:
     """
@@ -52,22 +57,66 @@ def download_worldpop_data(year: int, output_dir: Optional[str] = None) -> Path:
             print(f"  - {tif}")
         return output_file
     
-    print(f"Downloading WorldPop data for {year}...")
-    response = requests.get(url, stream=True)
+    # The download goes to a .part file that is only renamed once complete,
+    # so an interrupted download is resumed with a Range request instead of
+    # being restarted, and is never mistaken for a finished zip
+    partial_file = output_file.with_name(output_file.name + ".part")
+    existing = partial_file.stat().st_size if partial_file.exists() else 0
+    headers = {"Range": f"bytes={existing}-"} if existing else {}
+    
+    if existing:
+        print(f"Resuming WorldPop download for {year} from {existing} bytes...")
+    else:
+        print(f"Downloading WorldPop data for {year}...")
+    response = requests.get(url, stream=True, headers=headers)
+    
+    # A 416 means the range starts at or past the end of the file, which is
+    # only a finished download if the .part file has exactly the full size
+    if existing and response.status_code == 416:
+        content_range = response.headers.get('content-range', '')
+        response.close()
+        if content_range.startswith('bytes */'):
+            full_size = int(content_range[len('bytes */'):])
+        else:
+            head = requests.head(url, allow_redirects=True)
+            head.raise_for_status()
+            full_size = int(head.headers.get('content-length', -1))
+        
+        if existing == full_size:
+            partial_file.replace(output_file)
+            print(f"Download complete: {output_file}")
+            return output_file
+        
+        print("Partial download does not match the remote file, restarting...")
+        partial_file.unlink()
+        existing = 0
+        response = requests.get(url, stream=True)
+    
     response.raise_for_status()
     
+    # Servers that ignore the Range header send the whole file again
+    if response.status_code != 206:
+        existing = 0
+    
     total_size = int(response.headers.get('content-length', 0))
-    downloaded = 0
+    if total_size:
+        total_size += existing
+    downloaded = existing
+    last_print = existing
     
-    with open(output_file, 'wb') as f:
-        for chunk in response.iter_content(chunk_size=8192):
+    with open(partial_file, 'ab' if existing else 'wb', buffering=CHUNK_SIZE) as f:
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
             if chunk:
                 f.write(chunk)
                 downloaded += len(chunk)
-                if total_size:
+                if total_size and (
+                    downloaded - last_print >= PROGRESS_EVERY or downloaded == total_size
+                ):
+                    last_print = downloaded
                     percent = (downloaded / total_size) * 100
                     print(f"  Progress: {percent:.1f}%", end='\r')
     
+    partial_file.replace(output_file)
     print(f"\nDownload complete: {output_file}")
     return output_file
 
@@ -1,59 +1,41 @@
-"""This module contains functions for unzipping WorldPop files and deleting them after processing."""
+"""This module contains functions for locating the TIFs of WorldPop files."""
 import zipfile
 from pathlib import Path
 from typing import Optional, List
 
 
-def extract_worldpop_zip(zip_path: str, extract_dir: Optional[str] = None) -> Path:
+def get_worldpop_rasters(zip_path: str, extract_dir: Optional[str] = None) -> List[str]:
     """
-    Extract WorldPop zip file to a directory.
+    Get the paths of the WorldPop TIF files, read in place from the zip.
+    
+    GDAL reads the TIFs straight out of the zip through its /vsizip/ virtual
+    file system, so nothing is extracted to disk. If the zip is not available
+    (the download is skipped once extracted TIFs exist), the extracted TIFs
+    are returned instead.
     
     Parameters
     ----------
     zip_path : str
         Path to the WorldPop zip file.
     extract_dir : str, optional
-        Directory to extract to. If None, extracts to same directory as zip.
+        Directory holding previously extracted TIFs. If None, same directory as zip.
     
     Returns
     -------
-    Path
-        Path to the extraction directory.
+    List[str]
+        Raster paths that can be opened with rasterio/GDAL.
     """
     zip_path = Path(zip_path)
     
-    if extract_dir is None:
-        extract_dir = zip_path.parent / zip_path.stem
-    else:
-        extract_dir = Path(extract_dir)
-    
-    extract_dir.mkdir(parents=True, exist_ok=True)
-    
-    existing_tifs = list(extract_dir.glob("*.tif"))
-    if existing_tifs:
-        print(f"TIF files already extracted in: {extract_dir}")
-        return extract_dir
+    if not zip_path.exists():
+        if extract_dir is None:
+            extract_dir = zip_path.parent / zip_path.stem
+        return [str(tif) for tif in get_tif_files(extract_dir)]
     
     with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        zip_ref.extractall(extract_dir)
-    
-    print(f"Extracted to: {extract_dir}")
-    return extract_dir
-
-
-def delete_tif_file(tif_path: Path) -> None:
-    """
-    Delete a TIF file after processing.
+        names = sorted(name for name in zip_ref.namelist() if name.endswith(".tif"))
     
-    Parameters
-    ----------
-    tif_path : Path
-        Path to the TIF file to delete.
-    """
-    tif_path = Path(tif_path)
-    if tif_path.exists():
-        tif_path.unlink()
-        print(f"Deleted: {tif_path.name}")
+    return [f"/vsizip/{zip_path.resolve()}/{name}" for name in names]
 
 
 def get_tif_files(extract_dir: Path) -> List[Path]:
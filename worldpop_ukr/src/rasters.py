@@ -1,12 +1,18 @@
 """This module contains functions for processing WorldPop rasters."""
 
+import re
 import rioxarray
+import rasterio
 import xarray as xr
 import geopandas as gpd
 import numpy as np
+from rasterio.features import rasterize
 from pathlib import Path
-from typing import Dict, Any, Tuple
-from rasterstats import zonal_stats
+from typing import Dict, Any, Optional, Tuple
+
+
+# iso, sex, age group and year at the start of a WorldPop filename
+WORLDPOP_FILENAME_RE = re.compile(r"([A-Za-z]+)_([A-Za-z]+)_([A-Za-z0-9-]+)_(\d{4})(?:[_.]|$)")
 
 
 def open_worldpop_raster(raster_path: str) -> xr.Dataset:
@@ -64,57 +70,125 @@ def parse_worldpop_filename(filename: str) -> Dict[str, str]:
     Parameters
     ----------
     filename : str
-        WorldPop filename.
+        WorldPop filename or path to a WorldPop raster.
     
     Returns
     -------
     dict
         Dictionary with keys: iso, sex, age_group, year
     """
-    stem = Path(filename).stem
-    parts = stem.split("_")
-    
-    sex = parts[1]
-    age_group = parts[2]
+    match = WORLDPOP_FILENAME_RE.match(Path(filename).name)
+    if match is None:
+        raise ValueError(f"Not a WorldPop raster filename: {filename}")
+    iso, sex, age_group, year = match.groups()
     
     if sex == "T" and age_group in ["F", "M"]:
         sex, age_group = age_group, sex
     
     return {
-        "iso": parts[0],
+        "iso": iso,
         "sex": sex,
         "age_group": age_group,
-        "year": parts[3],
+        "year": year,
     }
 
 
-def sum_population_for_geometries(tif_path: str, geometries: gpd.GeoDataFrame) -> list:
+def to_raster_crs(geometries: gpd.GeoDataFrame, raster_path: str) -> gpd.GeoDataFrame:
     """
-    Calculate zonal statistics (sum) for geometries using rasterstats.
+    Reproject geometries to the CRS of a raster, if they are not in it already.
     
     Parameters
     ----------
-    tif_path : str
-        Path to the raster TIF file.
     geometries : gpd.GeoDataFrame
-        GeoDataFrame with geometries to calculate stats for.
+        GeoDataFrame with the geometries to reproject.
+    raster_path : str
+        Path to the raster TIF file whose CRS is used.
+    
+    Returns
+    -------
+    gpd.GeoDataFrame
+        The geometries in the raster CRS.
+    """
+    with rasterio.open(raster_path) as src:
+        raster_crs = src.crs
     
+    if geometries.crs is not None and geometries.crs != raster_crs:
+        geometries = geometries.to_crs(raster_crs)
+    
+    return geometries
+
+
+def sum_population_by_labels(
+    raster_path: str,
+    geometries: gpd.GeoDataFrame,
+    label_cache: Optional[Dict[Tuple, np.ndarray]] = None,
+) -> list:
+    """
+    Calculate population sums for all geometries in a single pass over the raster.
+
+    Each geometry's position (plus one) is burned into a label raster on the
+    grid of the population raster, and the population sums are taken for every
+    label at once with ``np.bincount``. Pixels are assigned by their center
+    (``all_touched=False``), so geometries are expected not to overlap.
+
+    The label raster only depends on the geometries and the raster grid, so it
+    can be reused across rasters on the same grid through ``label_cache``.
+
+    Parameters
+    ----------
+    raster_path : str
+        Path to the raster TIF file.
+    geometries : gpd.GeoDataFrame
+        GeoDataFrame with geometries to calculate sums for.
+    label_cache : dict, optional
+        Cache of the label raster for the last grid seen, keyed by CRS,
+        transform and shape. It must only be shared between calls with the
+        same geometries.
+
     Returns
     -------
     list
         List of population sums, one per geometry.
     """
-    try:
-        stats = zonal_stats(
-            geometries,
-            tif_path,
-            stats=['sum'],
-            nodata=-99999., # Fill value on the rasters
-            all_touched=False
-        )
-        
-        pop_sums = [float(stat.get('sum', 0) or 0) for stat in stats]
-        return pop_sums
-    except Exception as e:
-        print(f"Error calculating zonal stats for {tif_path}: {e}")
-        return [0.0] * len(geometries)
+    with rasterio.open(raster_path) as src:
+        data = src.read(1)
+        nodata = src.nodata if src.nodata is not None else -99999.
+        grid = (src.crs.to_string(), src.transform, data.shape)
+
+        labels = label_cache.get(grid) if label_cache is not None else None
+        if labels is None:
+            if geometries.crs is not None and geometries.crs != src.crs:
+                geometries = geometries.to_crs(src.crs)
+
+            labels = rasterize(
+                (
+                    (geom, i)
+                    for i, geom in enumerate(geometries.geometry, 1)
+                    if geom is not None and not geom.is_empty
+                ),
+                out_shape=data.shape,
+                transform=src.transform,
+                fill=0,
+                dtype="int32",
+                all_touched=False,
+            )
+
+            # Only the last grid is kept, to hold a single label raster in memory
+            if label_cache is not None:
+                label_cache.clear()
+                label_cache[grid] = labels
+
+    # Keep the band in its native float32 and build the mask in one pass:
+    # NaNs and the negative WorldPop fill value fail ``>= 0`` on their own
+    valid = data >= 0
+    if nodata >= 0:
+        valid &= data != nodata
+
+    # bincount accumulates the weights in float64
+    sums = np.bincount(
+        labels[valid],
+        weights=data[valid],
+        minlength=len(geometries) + 1,
+    )
+
+    return sums[1:].tolist()
@@ -1,7 +1,13 @@
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Optional
+import os
 import sys
 import pandas as pd
 import geopandas as gpd
+import pyarrow as pa
+import rasterio
+import pyarrow.csv as pacsv
 from tqdm import tqdm
 
 project_root = Path(__file__).parent.parent
@@ -9,12 +15,26 @@ if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
 from src.download import download_worldpop_data
-from src.file_managing import extract_worldpop_zip, delete_tif_file, get_tif_files
-from src.rasters import parse_worldpop_filename, sum_population_for_geometries
+from src.file_managing import get_worldpop_rasters
+from src.rasters import parse_worldpop_filename, sum_population_by_labels, to_raster_crs
 
 
 YEARS = [2020, 2021, 2022]
 
+# Each worker holds a full raster band and its label raster in memory, so
+# the pool is kept small rather than sized to every core
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+# GDAL settings for the raster reads in each worker: the cores left over by
+# the pool decode the compressed TIF blocks, and the block and /vsizip/ read
+# caches are sized for a full-band read of a WorldPop raster
+GDAL_OPTIONS = {
+    "GDAL_NUM_THREADS": max(1, (os.cpu_count() or 1) // MAX_WORKERS),
+    "GDAL_CACHEMAX": 256,
+    "VSI_CACHE": True,
+    "VSI_CACHE_SIZE": 256 * 1024 * 1024,
+}
+
 
 def get_project_paths():
     """Get project directory paths."""
@@ -29,13 +49,21 @@ def get_project_paths():
     }
 
 
+def read_geometries(path: Path) -> gpd.GeoDataFrame:
+    """Read a GeoJSON file, preferring its GeoParquet copy when there is one."""
+    parquet_path = path.with_suffix(".parquet")
+    if parquet_path.exists():
+        return gpd.read_parquet(parquet_path)
+    return gpd.read_file(path)
+
+
 def load_geometries(paths: dict) -> tuple:
     """Load ADM3 and ADM4 with outskirts geometries."""
     adm3_path = paths["aoi_dir"] / "adm3.geojson"
     adm4_path = paths["aoi_dir"] / "adm4_w_outskirts.geojson"
     
-    adm3 = gpd.read_file(adm3_path)
-    adm4 = gpd.read_file(adm4_path)
+    adm3 = read_geometries(adm3_path)
+    adm4 = read_geometries(adm4_path)
     
     print(f"Loaded {len(adm3)} ADM3 geometries")
     print(f"Loaded {len(adm4)} ADM4 (with outskirts) geometries")
@@ -49,30 +77,54 @@ def get_output_csv_path(paths: dict, year: int, admin_level: str) -> Path:
 
 
 def process_raster_for_geometries(
-    raster_path: Path,
+    raster_path: str,
     geometries: gpd.GeoDataFrame,
     pcode_column: str,
-) -> list:
+    label_cache: Optional[dict] = None,
+) -> pd.DataFrame:
     """
     Process a single raster file for all geometries.
     
-    Returns list of dicts with pcode, sex, age_group, pop.
+    Returns a DataFrame with pcode, sex, age_group, pop columns, one row per geometry.
     """
-    metadata = parse_worldpop_filename(raster_path.name)
+    metadata = parse_worldpop_filename(Path(raster_path).name)
     
-    pop_sums = sum_population_for_geometries(str(raster_path), geometries)
+    pop_sums = sum_population_by_labels(raster_path, geometries, label_cache=label_cache)
     
-    results = [
+    # Built column-wise, without a dict per geometry
+    return pd.DataFrame(
         {
-            pcode_column.lower(): pcode,
+            pcode_column.lower(): geometries[pcode_column].to_numpy(),
             "sex": metadata["sex"],
             "age_group": metadata["age_group"],
-            "pop": pop_sum,
+            "pop": pop_sums,
         }
-        for pcode, pop_sum in zip(geometries[pcode_column], pop_sums)
-    ]
-    
-    return results
+    )
+
+
+# Geometries shared by the rasters processed in a worker process, set once per
+# process by _init_raster_worker instead of being pickled for every raster
+_worker_geometries = None
+_worker_pcode_column = None
+# The rasters of a year share a grid, so each worker rasterizes the geometries
+# once and reuses the labels for the rest of its rasters
+_worker_label_cache = {}
+
+
+def _init_raster_worker(geometries: gpd.GeoDataFrame, pcode_column: str) -> None:
+    """Store the geometries and pcode column for process_raster_in_worker."""
+    global _worker_geometries, _worker_pcode_column, _worker_label_cache
+    _worker_geometries = geometries
+    _worker_pcode_column = pcode_column
+    _worker_label_cache = {}
+
+
+def process_raster_in_worker(raster_path: str) -> pd.DataFrame:
+    """Process a single raster file in a worker process started by process_year_admin_level."""
+    with rasterio.Env(**GDAL_OPTIONS):
+        return process_raster_for_geometries(
+            raster_path, _worker_geometries, _worker_pcode_column, _worker_label_cache
+        )
 
 
 def process_year_admin_level(
@@ -81,7 +133,7 @@ def process_year_admin_level(
     geometries: gpd.GeoDataFrame,
     admin_level: str,
     pcode_column: str,
-    delete_tifs: bool = True,
+    max_workers: int = MAX_WORKERS,
 ) -> None:
     """
     Process all WorldPop rasters for a year and admin level.
@@ -98,8 +150,8 @@ def process_year_admin_level(
         Admin level name (adm3 or adm4).
     pcode_column : str
         Column name for pcode in geometries.
-    delete_tifs : bool
-        Whether to delete TIF files after processing.
+    max_workers : int
+        Number of processes the raster files are spread over.
     """
     output_csv = get_output_csv_path(paths, year, admin_level)
     
@@ -110,31 +162,57 @@ def process_year_admin_level(
     year_dir = paths["worldpop_dir"] / str(year)
     zip_file = download_worldpop_data(year, output_dir=year_dir)
     extract_dir = year_dir / "extracted"
-    extract_worldpop_zip(zip_file, extract_dir=extract_dir)
     
-    tif_files = get_tif_files(extract_dir)
-    if not tif_files:
-        print(f"  Warning: No TIF files found in {extract_dir}")
+    # The rasters are read straight from the zip, without extracting them
+    raster_paths = get_worldpop_rasters(zip_file, extract_dir=extract_dir)
+    if not raster_paths:
+        print(f"  Warning: No TIF files found in {zip_file} or {extract_dir}")
         return
     
-    print(f"  Processing {len(tif_files)} raster files for {len(geometries)} geometries...")
+    print(f"  Processing {len(raster_paths)} raster files for {len(geometries)} geometries...")
     
-    all_results = []
+    # All rasters of a year share a grid, so the geometries are reprojected
+    # once here rather than for every raster
+    geometries = to_raster_crs(geometries, raster_paths[0])
     
-    for i, tif_path in enumerate(tif_files, 1):
-        print(f"    [{i}/{len(tif_files)}] {tif_path.name}")
-        
-        results = process_raster_for_geometries(tif_path, geometries, pcode_column)
-        all_results.extend(results)
-        
-        if delete_tifs:
-            delete_tif_file(tif_path)
+    paths["output_dir"].mkdir(parents=True, exist_ok=True)
+    # Each raster's rows are appended to the CSV as they arrive instead of
+    # being held until the end; a partial file is only renamed into place
+    # once every raster is written, so an interrupted run is not skipped
+    partial_csv = output_csv.with_name(output_csv.name + ".partial")
+    writer = None
     
-    df = pd.DataFrame(all_results)
-    df["year"] = year
+    try:
+        # Rasters are independent, so they are processed in parallel; map keeps
+        # the results in file order
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_raster_worker,
+            initargs=(geometries, pcode_column),
+        ) as executor:
+            for i, (raster_path, results) in enumerate(
+                zip(raster_paths, executor.map(process_raster_in_worker, raster_paths)), 1
+            ):
+                print(f"    [{i}/{len(raster_paths)}] {Path(raster_path).name}")
+                results["year"] = year
+                table = pa.Table.from_pandas(results, preserve_index=False)
+                
+                # pyarrow's writer formats the rows in C++, which matters for
+                # ADM4 runs with millions of rows. With "needed" quoting, Arrow
+                # quotes the header and every string value (pcode, sex,
+                # age_group), unlike the unquoted strings pandas wrote
+                if writer is None:
+                    writer = pacsv.CSVWriter(
+                        str(partial_csv),
+                        table.schema,
+                        write_options=pacsv.WriteOptions(quoting_style="needed"),
+                    )
+                writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
     
-    paths["output_dir"].mkdir(parents=True, exist_ok=True)
-    df.to_csv(output_csv, index=False)
+    partial_csv.replace(output_csv)
     print(f"  Saved: {output_csv.name}")
 
 
@@ -161,7 +239,6 @@ def main():
             geometries=adm3,
             admin_level="adm3",
             pcode_column="ADM3_PCODE",
-            delete_tifs=False,
         )
         
         print(f"\n[ADM4] Processing {year}...")
@@ -171,7 +248,6 @@ def main():
             geometries=adm4,
             admin_level="adm4",
             pcode_column="ADM4_PCODE",
-            delete_tifs=True,
         )
     
     print(f"\n{'='*60}")
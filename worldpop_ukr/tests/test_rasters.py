@@ -0,0 +1,46 @@
+import pytest
+
+from src.rasters import parse_worldpop_filename
+
+
+def test_parse_worldpop_filename():
+    assert parse_worldpop_filename("ukr_f_00_2020_CN_100m_R2025A_v1.tif") == {
+        "iso": "ukr",
+        "sex": "f",
+        "age_group": "00",
+        "year": "2020",
+    }
+
+
+def test_parse_worldpop_filename_swaps_totals():
+    metadata = parse_worldpop_filename("ukr_T_F_2021_CN_100m_R2025A_v1.tif")
+
+    assert (metadata["sex"], metadata["age_group"]) == ("F", "T")
+
+
+@pytest.mark.parametrize(
+    "filename, expected",
+    [
+        ("ukr_f_00_2020.tif", ("ukr", "f", "00", "2020")),
+        ("/data/worldpop/ukr_m_80_2022_CN_100m_R2025A_v1.tif", ("ukr", "m", "80", "2022")),
+        ("ukr_f_0-1_2020_CN_100m_R2025A_v1.tif", ("ukr", "f", "0-1", "2020")),
+    ],
+)
+def test_parse_worldpop_filename_variants(filename, expected):
+    metadata = parse_worldpop_filename(filename)
+
+    assert (metadata["iso"], metadata["sex"], metadata["age_group"], metadata["year"]) == expected
+
+
+def test_parse_worldpop_filename_other_country_codes():
+    assert parse_worldpop_filename("pol_m_05_2020_CN_100m_R2025A_v1.tif")["iso"] == "pol"
+
+
+def test_parse_worldpop_filename_rejects_short_names():
+    with pytest.raises(ValueError):
+        parse_worldpop_filename("ukr_f_00.tif")
+
+
+def test_parse_worldpop_filename_rejects_non_year_fields():
+    with pytest.raises(ValueError):
+        parse_worldpop_filename("ukr_f_00_20201_CN_100m_R2025A_v1.tif")